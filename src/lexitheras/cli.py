@@ -3,12 +3,21 @@ Command-line interface for Lexitheras
 """
 
 import click
-import re
+import string
 from .search import PerseusTextSearcher
 from .scraper import PerseusVocabScraper
 from .deck import AnkiDeckCreator
 
 
+class _SafeTable(dict):
+    """str.translate table replacing anything but [a-zA-Z0-9_-] with '_'"""
+    def __missing__(self, key):
+        return '_'
+
+
+_SAFE_TABLE = _SafeTable((ord(c), c) for c in string.ascii_letters + string.digits + '_-')
+
+
 @click.command()
 @click.argument('text_identifier')
 @click.option('--output', '-o', default=None, help='Output filename for Anki deck')
@@ -23,12 +32,10 @@ def main(text_identifier, output, deck_name, list_texts, search_only, limit):
     TEXT_IDENTIFIER: Either a URN (e.g., urn:cts:greekLit:tlg0012.tlg001.perseus-grc2)
                      or a search term (e.g., "iliad", "homer", "symposium")
     """
-    searcher = PerseusTextSearcher()
-    
     # Handle --list-texts flag
     if list_texts:
         click.echo("Fetching all available texts...")
-        texts = searcher.get_all_texts()
+        texts = PerseusTextSearcher().get_all_texts()
         
         # Group by author
         by_author = {}
@@ -53,6 +60,7 @@ def main(text_identifier, output, deck_name, list_texts, search_only, limit):
     else:
         # Search for text
         click.echo(f"Searching for '{text_identifier}'...")
+        searcher = PerseusTextSearcher()
         matches = searcher.search_texts(text_identifier)
         
         if not matches:
@@ -93,8 +101,8 @@ def main(text_identifier, output, deck_name, list_texts, search_only, limit):
         # Generate output filename from URN or selected text
         if selected_text:
             # Clean filename
-            safe_title = re.sub(r'[^a-zA-Z0-9_-]', '_', selected_text['title'])
-            safe_author = re.sub(r'[^a-zA-Z0-9_-]', '_', selected_text['author'])
+            safe_title = selected_text['title'].translate(_SAFE_TABLE)
+            safe_author = selected_text['author'].translate(_SAFE_TABLE)
             output = f"{safe_author}_{safe_title}.apkg"
         else:
             safe_name = text_urn.replace(':', '_').replace('.', '_')
@@ -115,19 +123,19 @@ def main(text_identifier, output, deck_name, list_texts, search_only, limit):
     
     try:
         scraper = PerseusVocabScraper()
-        vocab_items = scraper.scrape_vocabulary_list(text_urn)
+        vocab = scraper.scrape_vocabulary_list(text_urn)
         
-        click.echo(f"Found {len(vocab_items)} vocabulary items")
+        click.echo(f"Found {len(vocab['words'])} vocabulary items")
         
         # Apply limit if specified
-        if limit > 0 and len(vocab_items) > limit:
-            vocab_items = vocab_items[:limit]
+        if limit > 0 and len(vocab['words']) > limit:
+            vocab = {key: column[:limit] for key, column in vocab.items()}
             click.echo(f"Limited to {limit} items")
         
         # Create Anki deck
-        deck_creator = AnkiDeckCreator(deck_name)
-        deck_creator.add_vocabulary_items(vocab_items)
-        deck_creator.save_deck(output)
+        deck_creator = AnkiDeckCreator(deck_name, key=text_urn)
+        deck_creator.add_vocabulary_items(vocab)
+        deck_creator.save_deck(output).result()
         
         click.echo(f"Successfully created Anki deck: {output}")
         
@@ -3,63 +3,97 @@ Anki deck creation functionality
 """
 
 import genanki
-import random
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 
+# Package writes run in the background so they can overlap with scraping
+_WRITER_POOL = ThreadPoolExecutor(max_workers=2)
 
-class AnkiDeckCreator:
-    def __init__(self, deck_name):
-        self.deck_id = random.randrange(1 << 30, 1 << 31)
-        self.deck = genanki.Deck(self.deck_id, deck_name)
-        self.model = self._create_model()
-    
-    def _create_model(self):
-        """Create Anki note model for Greek vocabulary"""
-        return genanki.Model(
-            random.randrange(1 << 30, 1 << 31),
-            'Greek Vocabulary',
-            fields=[
-                {'name': 'Greek'},
-                {'name': 'Translation'},
-                {'name': 'Rank'},
-                {'name': 'Count'}
-            ],
-            templates=[
-                {
-                    'name': 'Greek to English',
-                    'qfmt': '<div style="font-size: 32px;">{{Greek}}</div>',
-                    'afmt': '''{{FrontSide}}<hr id="answer">
+
+def _stable_id(name):
+    """Deterministic Anki ID in [2**30, 2**31) derived from name"""
+    digest = hashlib.blake2b(name.encode('utf-8'), digest_size=4).digest()
+    return (1 << 30) + int.from_bytes(digest, 'big') % (1 << 30)
+
+
+# Note model shared by every deck; it never changes at runtime
+_GREEK_MODEL = genanki.Model(
+    _stable_id('lexitheras-greek-v1'),
+    'Greek Vocabulary',
+    fields=[
+        {'name': 'Greek'},
+        {'name': 'Translation'},
+        {'name': 'Rank'},
+        {'name': 'Count'}
+    ],
+    templates=[
+        {
+            'name': 'Greek to English',
+            'qfmt': '<div style="font-size: 32px;">{{Greek}}</div>',
+            'afmt': '''{{FrontSide}}<hr id="answer">
 <div style="font-size: 24px; margin: 20px 0;">{{Translation}}</div>
 <div style="font-size: 14px; color: #666; margin-top: 20px;">
 Rank: {{Rank}} | Occurrences: {{Count}}
 </div>''',
-                }
-            ],
-            css='''
-            .card {
-                font-family: 'Segoe UI', Arial, sans-serif;
-                font-size: 20px;
-                text-align: center;
-                color: black;
-                background-color: white;
-                padding: 20px;
-            }
-            '''
-        )
+        }
+    ],
+    css='''
+    .card {
+        font-family: 'Segoe UI', Arial, sans-serif;
+        font-size: 20px;
+        text-align: center;
+        color: black;
+        background-color: white;
+        padding: 20px;
+    }
+    '''
+)
+
+
+class AnkiDeckCreator:
+    def __init__(self, deck_name, key=None):
+        # key identifies the text (e.g. its URN) independently of the display
+        # name; the same key gives the same ID, so Anki updates the deck on
+        # re-import. Falls back to the deck name when no key is given.
+        self.key = key or deck_name
+        self.deck_id = _stable_id(self.key)
+        self.deck = genanki.Deck(self.deck_id, deck_name)
+        self.model = _GREEK_MODEL
     
-    def add_vocabulary_items(self, vocab_items):
-        """Add vocabulary items to the deck"""
-        for item in vocab_items:
-            note = genanki.Note(
-                model=self.model,
-                fields=[
-                    item['word'],
-                    item['translation'],
-                    str(item['rank']),
-                    str(item.get('count', 0))
-                ]
-            )
-            self.deck.add_note(note)
+    def add_vocabulary_items(self, vocab):
+        """Add vocabulary items to the deck
+        
+        vocab is a dict of parallel lists as returned by
+        PerseusVocabScraper.scrape_vocabulary_list.
+        """
+        model = self.model
+        key = self.key
+        Note = genanki.Note
+        guid_for = genanki.guid_for
+        notes = []
+        occurrences = {}
+        for word, translation, rank, count in zip(
+                vocab['words'], vocab['translations'], vocab['ranks'], vocab['counts']):
+            # Key GUIDs on the text and word (not the display name, or
+            # rank/count, which change between scrapes) so re-importing a
+            # regenerated deck updates existing notes. Repeats of a word/definition pair are numbered so each
+            # keeps its own note.
+            occurrence = occurrences.get((word, translation), 0)
+            occurrences[(word, translation)] = occurrence + 1
+            if occurrence:
+                guid = guid_for(key, word, translation, occurrence)
+            else:
+                guid = guid_for(key, word, translation)
+            notes.append(Note(model=model,
+                              fields=[word, translation, str(rank), str(count)],
+                              guid=guid))
+        self.deck.notes.extend(notes)
     
     def save_deck(self, filename):
-        """Save the deck to a .apkg file"""
-        genanki.Package(self.deck).write_to_file(filename)
\ No newline at end of file
+        """Save the deck to a .apkg file in a background thread
+        
+        Returns a Future; call .result() to wait for the write and raise
+        any error from it. The deck should not be modified until then.
+        """
+        package = genanki.Package(self.deck)
+        return _WRITER_POOL.submit(package.write_to_file, filename)
\ No newline at end of file
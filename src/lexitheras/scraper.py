@@ -2,72 +2,182 @@
 Perseus vocabulary scraper
 """
 
-import requests
-from bs4 import BeautifulSoup
-import re
+import lxml.html
+from lxml import etree
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from .session import create_session
+
+
+def _has_class(name):
+    """XPath predicate matching elements whose class list includes name"""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+# Compiled once; evaluated by libxml2 for every page and row
+_WORD_LIST_TABLE = etree.XPath(f'//table[{_has_class("word-list")}]')
+_DATA_ROWS = etree.XPath('(.//tr)[position() > 1]')
+
+# Cells of a word-list row, and their whitespace-normalized text
+_LEMMA_CELLS = etree.XPath(f'.//*[{_has_class("lemma_text")}]')
+_SHORTDEF_CELLS = etree.XPath(f'.//td[{_has_class("shortdef")}]')
+_COUNT_TEXT = etree.XPath(
+    f'normalize-space(.//td[{_has_class("count")}])', smart_strings=False)
+_CELL_TEXT = etree.XPath('normalize-space()', smart_strings=False)
 
 
 class PerseusVocabScraper:
     def __init__(self):
         self.base_url = "https://vocab.perseus.org"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
-        })
+        self.session = create_session()
+        # Limit concurrent requests against vocab.perseus.org
+        self.host_semaphore = threading.Semaphore(8)
+        self.cache_dir = os.path.expanduser('~/.lexitheras_vocab')
+        self.cache_duration = timedelta(days=7)
+    
+    def _vocab_cache_path(self, url):
+        """Path of the cache file for a word-list URL"""
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+    
+    def _load_vocab_cache(self, cache_path):
+        """Load a cached vocabulary list and whether it is still fresh"""
+        try:
+            mtime = os.path.getmtime(cache_path)
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None, False
+        fresh = time.time() - mtime < self.cache_duration.total_seconds()
+        return cache, fresh
+    
+    def _save_vocab_cache(self, cache_path, vocab, etag):
+        """Save a vocabulary list to cache, replacing any previous file atomically"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cache = {
+            'etag': etag,
+            # Lemmas are the same list as words, so only store it once
+            'vocab': {key: column for key, column in vocab.items() if key != 'lemmas'}
+        }
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, cache_path)
+        except:
+            os.remove(tmp_path)
+            raise
+    
+    def _cached_vocab(self, cache):
+        """Rebuild a vocabulary list from a cache entry"""
+        vocab = cache['vocab']
+        vocab['lemmas'] = vocab['words']
+        return vocab
     
     def scrape_vocabulary_list(self, text_urn, get_all_pages=True):
         """Scrape vocabulary from Perseus for a given text URN"""
-        vocab_items = []
-        
         # Use page=all to get all vocabulary at once
         if get_all_pages:
             url = f"{self.base_url}/word-list/{text_urn}/?page=all"
         else:
             url = f"{self.base_url}/word-list/{text_urn}/"
         
-        response = self.session.get(url)
+        # Try cache first
+        cache_path = self._vocab_cache_path(url)
+        cache, fresh = self._load_vocab_cache(cache_path)
+        if cache and fresh:
+            return self._cached_vocab(cache)
+        
+        # Revalidate a stale cache entry instead of downloading it again
+        headers = {}
+        if cache and cache.get('etag'):
+            headers['If-None-Match'] = cache['etag']
+        
+        with self.host_semaphore:
+            response = self.session.get(url, headers=headers)
+        
+        if response.status_code == 304 and cache:
+            os.utime(cache_path)
+            return self._cached_vocab(cache)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'lxml')
+        vocab = self._parse_vocabulary(response.content)
+        
+        # Save to cache
+        self._save_vocab_cache(cache_path, vocab, response.headers.get('ETag'))
+        return vocab
+    
+    def _parse_vocabulary(self, content):
+        """Extract vocabulary columns from a word-list page
+        
+        Returns a dict of parallel lists: words, lemmas, translations,
+        ranks and counts. Lemmas is the same list object as words.
+        """
+        words = []
+        translations = []
+        ranks = []
+        counts = []
+        # Perseus serves UTF-8; say so rather than relying on <meta charset>
+        parser = lxml.html.HTMLParser(encoding='utf-8')
+        tree = lxml.html.fromstring(content, parser=parser)
         
         # Find vocabulary table
-        table = soup.find('table', class_='word-list')
-        if not table:
+        tables = _WORD_LIST_TABLE(tree)
+        if not tables:
             raise ValueError("Could not find vocabulary table on page")
         
         # Get all rows (skip header)
-        rows = table.find_all('tr')[1:]
+        rows = _DATA_ROWS(tables[0])
         
         for idx, row in enumerate(rows, 1):
-            # Extract Greek word from element with class 'lemma_text'
-            lemma_elem = row.find(class_='lemma_text')
-            if not lemma_elem:
+            # Skip rows missing a cell; an empty cell is kept as ''.
+            # normalize-space() only trims XML whitespace, so strip()
+            # handles the rest (e.g. non-breaking spaces).
+            lemma_cells = _LEMMA_CELLS(row)
+            if not lemma_cells:
                 continue
-            greek_word = lemma_elem.text.strip()
+            greek_word = _CELL_TEXT(lemma_cells[0]).strip()
             
-            # Extract translation from td with class 'shortdef'
-            shortdef_elem = row.find('td', class_='shortdef')
-            if not shortdef_elem:
+            shortdef_cells = _SHORTDEF_CELLS(row)
+            if not shortdef_cells:
                 continue
-            translation = shortdef_elem.text.strip()
+            translation = _CELL_TEXT(shortdef_cells[0]).strip()
             
-            # Extract count from td with class 'count'
-            count_elem = row.find('td', class_='count')
-            count = 0
-            if count_elem:
-                count_text = count_elem.text.strip()
-                # Remove commas and convert to int
-                try:
-                    count = int(count_text.replace(',', ''))
-                except ValueError:
-                    count = 0
+            # Remove commas and convert to int
+            try:
+                count = int(_COUNT_TEXT(row).replace(',', ''))
+            except ValueError:
+                count = 0
             
-            vocab_items.append({
-                'rank': idx,
-                'word': greek_word,
-                'lemma': greek_word,
-                'translation': translation,
-                'count': count
-            })
+            words.append(greek_word)
+            translations.append(translation)
+            ranks.append(idx)
+            counts.append(count)
+        
+        return {
+            'words': words,
+            'lemmas': words,
+            'translations': translations,
+            'ranks': ranks,
+            'counts': counts
+        }
+    
+    def scrape_many(self, text_urns, max_workers=16):
+        """Scrape vocabulary for several text URNs in parallel
+        
+        Results are returned in the same order as text_urns.
+        """
+        def scrape(text_urn):
+            # Jitter start times to avoid synchronized bursts against the host
+            time.sleep(random.uniform(0, 0.1))
+            return self.scrape_vocabulary_list(text_urn)
         
-        return vocab_items
\ No newline at end of file
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(scrape, text_urns))
\ No newline at end of file
@@ -2,86 +2,185 @@
 Search functionality for Perseus texts
 """
 
-import requests
-from bs4 import BeautifulSoup
+from lxml import etree
 import json
 import os
 import re
-from datetime import datetime, timedelta
+import tempfile
+import time
+from bisect import bisect_left
+from io import BytesIO
+from datetime import timedelta
 from urllib.parse import urljoin
+from .session import create_session
+
+_URN_PREFIX = 'urn:cts:greekLit:'
+_TOKEN_RE = re.compile(r'\w+')
+
+# Common variations of titles and authors
+_VARIATIONS = {
+    'iliad': ['iliad', 'ilias'],
+    'odyssey': ['odyssey', 'odyssea'],
+    'anabasis': ['anabasis', 'anab'],
+    'symposium': ['symposium', 'symp'],
+    'republic': ['republic', 'politeia', 'res publica'],
+    'homer': ['homer', 'homerus'],
+    'plato': ['plato', 'platon'],
+    'xenophon': ['xenophon']
+}
+
+# Flattened alias -> canonical name lookup
+_ALIASES = {variant: canonical
+            for canonical, variants in _VARIATIONS.items()
+            for variant in variants}
 
 
 class PerseusTextSearcher:
     def __init__(self):
         self.base_url = "https://vocab.perseus.org"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
-        })
+        self.session = create_session()
         self.cache_file = os.path.expanduser('~/.lexitheras_cache.json')
         self.cache_duration = timedelta(days=7)
+        self._texts = None
+        self._token_index = {}
+        self._sorted_tokens = []
     
     def _load_cache(self):
         """Load cached text catalog"""
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    cache = json.load(f)
-                    cache_time = datetime.fromisoformat(cache['timestamp'])
-                    if datetime.now() - cache_time < self.cache_duration:
-                        return cache['texts']
-            except:
-                pass
-        return None
+        # Check freshness from the file's mtime before reading it
+        try:
+            mtime = os.path.getmtime(self.cache_file)
+        except OSError:
+            return None
+        if time.time() - mtime > self.cache_duration.total_seconds():
+            return None
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)['texts']
+        except:
+            return None
     
     def _save_cache(self, texts):
         """Save text catalog to cache"""
         cache = {
-            'timestamp': datetime.now().isoformat(),
             'texts': texts
         }
-        with open(self.cache_file, 'w', encoding='utf-8') as f:
-            json.dump(cache, f, ensure_ascii=False, indent=2)
+        # Write compact JSON to a uniquely named temporary file and swap it
+        # in, so an interrupted or concurrent write never leaves a
+        # truncated cache behind
+        fd, tmp_file = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(self.cache_file))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_file, self.cache_file)
+        except:
+            os.remove(tmp_file)
+            raise
+    
+    def _index_texts(self, texts):
+        """Build the lowercase word-suffix index used by search_texts"""
+        token_index = {}
+        for idx, text in enumerate(texts):
+            # Entries cached by older versions lack the lowercase fields
+            if '_title_lc' not in text:
+                text['_title_lc'] = text['title'].lower()
+                text['_author_lc'] = text['author'].lower()
+            # Index every suffix of every word, so a prefix lookup finds
+            # substrings anywhere inside a word, not just at its start
+            for token in _TOKEN_RE.findall(f"{text['_title_lc']} {text['_author_lc']}"):
+                for start in range(len(token)):
+                    token_index.setdefault(token[start:], set()).add(idx)
+        
+        self._texts = texts
+        self._token_index = token_index
+        self._sorted_tokens = sorted(token_index)
+    
+    def _substring_postings(self, token):
+        """Indices of texts with a title or author word containing token"""
+        postings = set()
+        pos = bisect_left(self._sorted_tokens, token)
+        while pos < len(self._sorted_tokens) and self._sorted_tokens[pos].startswith(token):
+            postings |= self._token_index[self._sorted_tokens[pos]]
+            pos += 1
+        return postings
+    
+    def _find(self, query_lower):
+        """Indices of texts whose title or author contains query_lower"""
+        texts = self._texts
+        
+        # Every word in the query lies within a single word of any matching
+        # title or author, so intersecting the index lookups yields a
+        # superset of the matches; confirm each with the full query
+        candidates = None
+        for token in _TOKEN_RE.findall(query_lower):
+            postings = self._substring_postings(token)
+            candidates = postings if candidates is None else candidates & postings
+            if not candidates:
+                break
+        
+        # Queries without any word characters can't use the index
+        if candidates is None:
+            candidates = range(len(texts))
+        
+        matches = [idx for idx in sorted(candidates)
+                   if query_lower in texts[idx]['_title_lc'] or query_lower in texts[idx]['_author_lc']]
+        return matches
     
     def get_all_texts(self):
         """Scrape all available texts from Perseus editions page"""
+        if self._texts is not None:
+            return self._texts
+        
         # Try cache first
         cached = self._load_cache()
         if cached:
+            self._index_texts(cached)
             return cached
         
         url = f"{self.base_url}/editions/"
         response = self.session.get(url)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'lxml')
         texts = []
         
         current_author = None
         
-        # Process all elements in order to maintain author groupings
-        for element in soup.find_all(['h4', 'a']):
-            if element.name == 'h4':
+        # Stream the (large) editions page, handling elements as they close.
+        # Perseus serves UTF-8, so decode raw bytes as such in libxml2.
+        context = etree.iterparse(BytesIO(response.content), events=('end',),
+                                  tag=('h4', 'a'), html=True, encoding='utf-8')
+        for _, element in context:
+            if element.tag == 'h4':
                 # New author section
-                current_author = element.text.strip()
-            elif element.name == 'a' and '/word-list/' in element.get('href', ''):
-                # Text under current author
-                title = element.text.strip()
+                current_author = ''.join(element.itertext()).strip()
+            else:
+                # Text under current author, linked as .../word-list/<urn>/
                 href = element.get('href', '')
-                
-                # Extract URN from URL
-                urn_match = re.search(r'word-list/(urn:cts:greekLit:[^/]+)', href)
-                if urn_match:
-                    urn = urn_match.group(1)
+                _, found, rest = href.partition('/word-list/')
+                urn = rest.split('/', 1)[0]
+                if found and urn.startswith(_URN_PREFIX) and urn != _URN_PREFIX:
+                    title = ''.join(element.itertext()).strip()
+                    author = current_author or 'Unknown'
                     texts.append({
-                        'author': current_author or 'Unknown',
+                        'author': author,
                         'title': title,
                         'urn': urn,
-                        'url': urljoin(self.base_url, href)
+                        'url': urljoin(self.base_url, href),
+                        '_title_lc': title.lower(),
+                        '_author_lc': author.lower()
                     })
+            
+            # Free elements that have already been processed. Links inside an
+            # author heading are left alone: the h4 still needs their text
+            # (and tail), and is cleared itself once it ends.
+            if element.tag == 'h4' or next(element.iterancestors('h4'), None) is None:
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
         
         # Save to cache
         self._save_cache(texts)
+        self._index_texts(texts)
         return texts
     
     def search_texts(self, query):
@@ -89,33 +188,16 @@ class PerseusTextSearcher:
         texts = self.get_all_texts()
         query_lower = query.lower()
         
-        matches = []
-        
         # First try exact matches
-        for text in texts:
-            if query_lower in text['title'].lower() or query_lower in text['author'].lower():
-                matches.append(text)
+        matches = [texts[idx] for idx in self._find(query_lower)]
         
-        # If no matches, try fuzzy matching
+        # If no matches, try common alternative names
         if not matches:
-            # Common variations
-            variations = {
-                'iliad': ['iliad', 'ilias'],
-                'odyssey': ['odyssey', 'odyssea'],
-                'anabasis': ['anabasis', 'anab'],
-                'symposium': ['symposium', 'symp'],
-                'republic': ['republic', 'politeia', 'res publica'],
-                'homer': ['homer', 'homerus'],
-                'plato': ['plato', 'platon'],
-                'xenophon': ['xenophon', 'xenophon']
-            }
-            
-            # Check variations
-            for key, variants in variations.items():
-                if query_lower in variants:
-                    for text in texts:
-                        if any(v in text['title'].lower() or v in text['author'].lower() 
-                               for v in [key] + variants):
-                            matches.append(text)
+            canonical = _ALIASES.get(query_lower)
+            if canonical:
+                found = set()
+                for variant in _VARIATIONS[canonical]:
+                    found.update(self._find(variant))
+                matches = [texts[idx] for idx in sorted(found)]
         
         return matches
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""
+HTTP session setup shared by the scraper and searcher
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def create_session():
+    """Create a requests session with pooled keep-alive connections and retries"""
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36',
+        'Connection': 'keep-alive'
+    })
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504]
+        )
+    )
+    session.mount('https://', adapter)
+    return session
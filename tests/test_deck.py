@@ -0,0 +1,76 @@
+"""
+Basic tests for deck creation
+"""
+
+from lexitheras.deck import AnkiDeckCreator
+
+
+VOCAB = {
+    'words': ['καί', 'λόγος'],
+    'translations': ['and', 'word'],
+    'ranks': [1, 2],
+    'counts': [1234, 56],
+}
+VOCAB['lemmas'] = VOCAB['words']
+
+
+def test_add_vocabulary_items():
+    """Test that each vocabulary item becomes a note"""
+    creator = AnkiDeckCreator('Test Deck')
+    creator.add_vocabulary_items(VOCAB)
+    assert [note.fields for note in creator.deck.notes] == [
+        ['καί', 'and', '1', '1234'],
+        ['λόγος', 'word', '2', '56'],
+    ]
+
+
+def test_note_guids_are_stable():
+    """Test that note GUIDs depend on the text key, not rank, count or deck name"""
+    urn = 'urn:cts:greekLit:tlg0012.tlg001.perseus-grc2'
+    creator = AnkiDeckCreator('Iliad - Homer', key=urn)
+    creator.add_vocabulary_items(VOCAB)
+    rescraped = AnkiDeckCreator('Greek Vocabulary - tlg0012.tlg001.perseus-grc2', key=urn)
+    rescraped.add_vocabulary_items(dict(VOCAB, ranks=[2, 1], counts=[1, 1]))
+    other = AnkiDeckCreator('Odyssey - Homer', key='urn:cts:greekLit:tlg0012.tlg002.perseus-grc2')
+    other.add_vocabulary_items(VOCAB)
+
+    guids = [note.guid for note in creator.deck.notes]
+    assert guids == [note.guid for note in rescraped.deck.notes]
+    assert not set(guids) & {note.guid for note in other.deck.notes}
+
+
+def test_repeated_words_keep_distinct_guids():
+    """Test that rows sharing a word and definition still get separate notes"""
+    creator = AnkiDeckCreator('Test Deck')
+    creator.add_vocabulary_items({
+        'words': ['εἰμί', 'εἰμί', 'καί'],
+        'translations': ['be', 'be', 'and'],
+        'ranks': [1, 2, 3],
+        'counts': [10, 5, 3],
+    })
+    guids = [note.guid for note in creator.deck.notes]
+    assert len(set(guids)) == 3
+
+    # The first occurrence keeps the same GUID as an unrepeated word
+    single = AnkiDeckCreator('Test Deck')
+    single.add_vocabulary_items({'words': ['εἰμί'], 'translations': ['be'], 'ranks': [1], 'counts': [10]})
+    assert guids[0] == single.deck.notes[0].guid
+
+
+def test_ids_are_deterministic():
+    """Test that deck and model IDs depend only on their names"""
+    first = AnkiDeckCreator('Test Deck')
+    second = AnkiDeckCreator('Test Deck')
+    assert first.deck_id == second.deck_id
+    assert first.model.model_id == second.model.model_id
+    assert AnkiDeckCreator('Other Deck').deck_id != first.deck_id
+    assert (1 << 30) <= first.deck_id < (1 << 31)
+
+
+def test_deck_id_follows_key():
+    """Test that the deck ID comes from the text key, not the display name"""
+    urn = 'urn:cts:greekLit:tlg0012.tlg001.perseus-grc2'
+    by_search = AnkiDeckCreator('Iliad - Homer', key=urn)
+    by_urn = AnkiDeckCreator('Greek Vocabulary - tlg0012.tlg001.perseus-grc2', key=urn)
+    assert by_search.deck_id == by_urn.deck_id
+    assert AnkiDeckCreator('Iliad - Homer').deck_id != by_search.deck_id
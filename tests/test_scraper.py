@@ -3,9 +3,32 @@ Basic tests for the scraper
 """
 
 import pytest
+from datetime import timedelta
 from lexitheras.scraper import PerseusVocabScraper
 
 
+WORD_LIST_HTML = """<html><body>
+<table class="table word-list">
+  <tr><th>Lemma</th><th>Definition</th><th>Count</th></tr>
+  <tr><td><span class="lemma_text">καί</span></td><td class="shortdef">and</td><td class="count">1,234</td></tr>
+  <tr><td><span class="lemma_text">λόγος</span></td><td class="shortdef"> word </td><td class="count">56</td></tr>
+  <tr><td><span class="lemma_text">ἄγε</span></td><td class="shortdef"></td><td class="count">7</td></tr>
+  <tr><td><span class="lemma_text">δή</span></td><td class="shortdef">\xa0indeed\xa0</td><td class="count">3</td></tr>
+  <tr><td><span class="lemma_text">μέν</span></td><td class="count">2</td></tr>
+</table>
+</body></html>""".encode('utf-8')
+
+
+class FakeResponse:
+    def __init__(self, content, status_code=200, headers=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
 def test_scraper_initialization():
     """Test that scraper initializes correctly"""
     scraper = PerseusVocabScraper()
@@ -19,6 +42,60 @@ def test_scraper_headers():
     assert 'User-Agent' in scraper.session.headers
 
 
+def test_scraper_connection_pool():
+    """Test that scraper mounts a pooled adapter with retries"""
+    scraper = PerseusVocabScraper()
+    adapter = scraper.session.get_adapter(scraper.base_url)
+    assert adapter._pool_maxsize == 32
+    assert adapter.max_retries.total == 3
+
+
+def test_scrape_parses_word_list(monkeypatch, tmp_path):
+    """Test that the word-list table is parsed into vocabulary items"""
+    scraper = PerseusVocabScraper()
+    scraper.cache_dir = str(tmp_path)
+    monkeypatch.setattr(scraper.session, 'get', lambda url, **kwargs: FakeResponse(WORD_LIST_HTML))
+    vocab = scraper.scrape_vocabulary_list('urn:cts:greekLit:tlg0001.tlg001.perseus-grc2')
+    # Rows with an empty definition are kept; rows without one are skipped
+    assert vocab['words'] == ['καί', 'λόγος', 'ἄγε', 'δή']
+    assert vocab['lemmas'] is vocab['words']
+    assert vocab['translations'] == ['and', 'word', '', 'indeed']
+    assert vocab['counts'] == [1234, 56, 7, 3]
+    assert list(vocab['ranks']) == [1, 2, 3, 4]
+
+
+def test_scrape_uses_vocab_cache(monkeypatch, tmp_path):
+    """Test that fresh cache entries skip the network and stale ones revalidate"""
+    scraper = PerseusVocabScraper()
+    scraper.cache_dir = str(tmp_path)
+    requests_seen = []
+
+    def fake_get(url, headers=None, **kwargs):
+        requests_seen.append(headers or {})
+        if (headers or {}).get('If-None-Match') == '"v1"':
+            return FakeResponse(b'', status_code=304)
+        return FakeResponse(WORD_LIST_HTML, headers={'ETag': '"v1"'})
+
+    monkeypatch.setattr(scraper.session, 'get', fake_get)
+    urn = 'urn:cts:greekLit:tlg0001.tlg001.perseus-grc2'
+    first = scraper.scrape_vocabulary_list(urn)
+    assert scraper.scrape_vocabulary_list(urn) == first
+    assert len(requests_seen) == 1
+
+    # Expire the cache entry; the next call should send the stored ETag
+    scraper.cache_duration = timedelta(0)
+    assert scraper.scrape_vocabulary_list(urn) == first
+    assert requests_seen[-1] == {'If-None-Match': '"v1"'}
+
+
+def test_scrape_many_preserves_order(monkeypatch):
+    """Test that parallel scraping returns results in input order"""
+    scraper = PerseusVocabScraper()
+    monkeypatch.setattr(scraper, 'scrape_vocabulary_list', lambda urn: urn.upper())
+    urns = ['urn:a', 'urn:b', 'urn:c']
+    assert scraper.scrape_many(urns) == ['URN:A', 'URN:B', 'URN:C']
+
+
 @pytest.mark.skip(reason="Requires network access")
 def test_scrape_small_text():
     """Test scraping a small text (requires internet)"""
@@ -0,0 +1,116 @@
+"""
+Basic tests for text search
+"""
+
+import os
+import pytest
+from lexitheras.search import PerseusTextSearcher
+
+
+CATALOG = [
+    {'author': 'Homer', 'title': 'Iliad', 'urn': 'urn:cts:greekLit:tlg0012.tlg001.perseus-grc2'},
+    {'author': 'Homer', 'title': 'Odyssey', 'urn': 'urn:cts:greekLit:tlg0012.tlg002.perseus-grc2'},
+    {'author': 'Plato', 'title': 'Symposium', 'urn': 'urn:cts:greekLit:tlg0059.tlg011.perseus-grc2'},
+    {'author': 'Xenophon', 'title': 'Symposium', 'urn': 'urn:cts:greekLit:tlg0032.tlg004.perseus-grc2'},
+    {'author': 'Plato', 'title': 'Republic', 'urn': 'urn:cts:greekLit:tlg0059.tlg030.perseus-grc2'},
+    {'author': 'Bion', 'title': 'Lament for Adonis', 'urn': 'urn:cts:greekLit:tlg0036.tlg001.perseus-grc1'},
+]
+
+
+EDITIONS_HTML = """<html><body>
+<h4><a href="/author/homer/">Homer</a></h4>
+<ul>
+  <li><a href="/word-list/urn:cts:greekLit:tlg0012.tlg001.perseus-grc2/">Iliad</a></li>
+  <li><a href="/about/">About</a></li>
+</ul>
+<h4>Plato <a href="/author/plato/">(Πλάτων)</a> Athens</h4>
+<ul>
+  <li><a href="/word-list/urn:cts:greekLit:tlg0059.tlg011.perseus-grc2/">Symposium</a></li>
+</ul>
+</body></html>""".encode('utf-8')
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+def make_searcher(monkeypatch):
+    searcher = PerseusTextSearcher()
+    catalog = [dict(text) for text in CATALOG]
+    monkeypatch.setattr(searcher, '_load_cache', lambda: catalog)
+    return searcher
+
+
+def titles(matches):
+    return [(text['author'], text['title']) for text in matches]
+
+
+def test_get_all_texts_parses_editions(monkeypatch, tmp_path):
+    """Test that the editions page is parsed into texts grouped by author"""
+    searcher = PerseusTextSearcher()
+    searcher.cache_file = str(tmp_path / 'cache.json')
+    monkeypatch.setattr(searcher.session, 'get', lambda url, **kwargs: FakeResponse(EDITIONS_HTML))
+    texts = searcher.get_all_texts()
+    assert [(text['author'], text['title'], text['urn']) for text in texts] == [
+        ('Homer', 'Iliad', 'urn:cts:greekLit:tlg0012.tlg001.perseus-grc2'),
+        ('Plato (Πλάτων) Athens', 'Symposium', 'urn:cts:greekLit:tlg0059.tlg011.perseus-grc2'),
+    ]
+    assert texts[0]['url'] == 'https://vocab.perseus.org/word-list/urn:cts:greekLit:tlg0012.tlg001.perseus-grc2/'
+    assert [path.name for path in tmp_path.iterdir()] == ['cache.json']
+
+    # A fresh searcher is served from the cache file
+    cached = PerseusTextSearcher()
+    cached.cache_file = searcher.cache_file
+    assert [text['urn'] for text in cached.get_all_texts()] == [text['urn'] for text in texts]
+
+    # Once the file is older than the cache duration it is ignored
+    os.utime(searcher.cache_file, (0, 0))
+    expired = PerseusTextSearcher()
+    expired.cache_file = searcher.cache_file
+    assert expired._load_cache() is None
+
+
+def test_save_cache_cleans_up_on_error(tmp_path):
+    """Test that a failed cache write leaves no file behind"""
+    searcher = PerseusTextSearcher()
+    searcher.cache_file = str(tmp_path / 'cache.json')
+    with pytest.raises(TypeError):
+        searcher._save_cache([{'title': object()}])
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_search_by_author(monkeypatch):
+    """Test that an author query returns all of their texts in catalog order"""
+    searcher = make_searcher(monkeypatch)
+    assert titles(searcher.search_texts('Homer')) == [('Homer', 'Iliad'), ('Homer', 'Odyssey')]
+
+
+def test_search_by_title_prefix(monkeypatch):
+    """Test that partial titles match"""
+    searcher = make_searcher(monkeypatch)
+    assert titles(searcher.search_texts('sympos')) == [('Plato', 'Symposium'), ('Xenophon', 'Symposium')]
+    assert titles(searcher.search_texts('plato symp')) == []
+
+
+def test_search_inside_word(monkeypatch):
+    """Test that substrings inside a word still match"""
+    searcher = make_searcher(monkeypatch)
+    assert titles(searcher.search_texts('dyss')) == [('Homer', 'Odyssey')]
+
+
+def test_search_mixes_word_start_and_inside_word(monkeypatch):
+    """Test that matches inside a word are kept alongside matches at a word start"""
+    searcher = make_searcher(monkeypatch)
+    assert titles(searcher.search_texts('ad')) == [('Homer', 'Iliad'), ('Bion', 'Lament for Adonis')]
+    assert titles(searcher.search_texts('for ad')) == [('Bion', 'Lament for Adonis')]
+
+
+def test_search_variations(monkeypatch):
+    """Test that common alternative names are recognized"""
+    searcher = make_searcher(monkeypatch)
+    assert titles(searcher.search_texts('ilias')) == [('Homer', 'Iliad')]
+    assert titles(searcher.search_texts('politeia')) == [('Plato', 'Republic')]